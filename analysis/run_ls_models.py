@@ -42,7 +42,8 @@ The modeling workflow is performed in the following stages:
    - Align latent coordinates across chains using Procrustes analysis.
 
 .. Note::
-    - All models are fit using CmdStanPy with parallel chains and custom initializations.
+    - All models are fit using CmdStanPy with parallel chains in a single process
+      and custom initializations.
     - Alignment uses functions from the ``utils.rotate`` module.
 
 .. Important::
@@ -59,6 +60,7 @@ Functions
     :template: function_name_only.rst
 
     run_stan_model
+    save_draws
 
 Standalone Execution
 =====================
@@ -92,11 +94,19 @@ __license__ = "GPL v3"
 __maintainer__ = "William Muntean"
 __date__ = "2025-08-29"
 
+import hashlib
+import os
+import platform
+import shutil
 import sys
 import time
 from pathlib import Path
 
 import cmdstanpy
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 ROOT_PATH = (
     Path("__file__").resolve().parents[0]
@@ -107,9 +117,20 @@ from utils import rotate
 DATA_PATH = ROOT_PATH / "data"
 RESULTS_PATH = ROOT_PATH / "results"
 MODEL_PATH = ROOT_PATH / "analysis" / "models"
+STAN_CACHE_PATH = ROOT_PATH / ".stan_cache"
 
+# Parameters not written to the draws parquet files: the uncentered item
+# positions are superseded by ``zt_centered``
+UNSAVED_VARS = ("zt",)
 
-def run_stan_model(model_path: Path | str, run_name: Path | str, stan_data: dict):
+
+def run_stan_model(
+    model_path: Path | str,
+    run_name: Path | str,
+    stan_data: dict,
+    threads_per_chain: int | None = None,
+    save_csv: bool = False,
+):
     """
     Fit a Stan latent space model and save results.
 
@@ -124,20 +145,33 @@ def run_stan_model(model_path: Path | str, run_name: Path | str, stan_data: dict
         Name for the output directory and result files.
     stan_data : dict
         Dictionary of data to pass to Stan.
+    threads_per_chain : int or None, optional
+        Threads available to ``reduce_sum`` within each chain. Default is
+        ``None`` (a quarter of the available CPUs, at least 1).
+    save_csv : bool, optional
+        Also keep the CmdStan CSV files in the run directory. Default is False.
 
     Returns
     -------
     None
 
     .. Note::
-        - Saves raw and aligned draws as parquet files in ``RESULTS_PATH``.
+        - All chains run in a single CmdStan process (``STAN_THREADS``), so
+          the data is loaded once and shared across chains.
+        - The pathfinder paths used for initialization run in parallel.
+        - Compiled executables are reused across runs via ``_load_model``.
+        - Saves raw and aligned draws as parquet files in ``RESULTS_PATH``
+          via ``save_draws``. All sampler diagnostics and Stan variables
+          except ``UNSAVED_VARS`` are kept; set ``save_csv=True`` to also
+          keep the CmdStan CSVs.
         - Uses ``utils.rotate`` for latent space alignment.
     """
-    model = cmdstanpy.CmdStanModel(
-        stan_file=model_path, cpp_options={"STAN_THREADS": True}
-    )
+    model = _load_model(model_path)
+
+    if threads_per_chain is None:
+        threads_per_chain = max(1, (os.cpu_count() or 1) // 4)
 
-    init_fit = model.pathfinder(data=stan_data, num_paths=4, draws=1000)
+    init_fit = model.pathfinder(data=stan_data, num_paths=4, draws=1000, num_threads=4)
 
     inits = init_fit.create_inits()
 
@@ -145,46 +179,211 @@ def run_stan_model(model_path: Path | str, run_name: Path | str, stan_data: dict
         data=stan_data,
         chains=4,
         parallel_chains=4,
+        threads_per_chain=threads_per_chain,
+        force_one_process_per_chain=False,
         iter_warmup=100,
         iter_sampling=800,
         show_progress=True,
         inits=inits,
     )
 
+    run_path = save_draws(_read_draws(fit), run_name, stan_data)
+    if save_csv:
+        fit.save_csvfiles(dir=run_path)
+
+
+def _load_model(model_path: Path | str) -> cmdstanpy.CmdStanModel:
+    """
+    Load a Stan model, reusing a cached executable when the source is unchanged.
+
+    Parameters
+    ----------
+    model_path : Path or str
+        Path to the Stan model file.
+
+    Returns
+    -------
+    cmdstanpy.CmdStanModel
+        Model built with ``STAN_THREADS``.
+
+    .. Note::
+        - Executables are cached in ``STAN_CACHE_PATH`` under a directory
+          named by a hash of the Stan source, any ``#include``d files, the
+          CmdStan version and the compile options, so editing the model or
+          upgrading CmdStan invalidates the cache automatically.
+    """
+    model_path = Path(model_path)
+    cpp_options = {"STAN_THREADS": True}
+
+    hasher = hashlib.sha256()
+    for source in _stan_sources(model_path):
+        hasher.update(source.read_bytes())
+    hasher.update(f"cmdstan={cmdstanpy.cmdstan_version()}".encode())
+    hasher.update(b"STAN_THREADS=1")
+    source_hash = hasher.hexdigest()[:16]
+    exe_suffix = ".exe" if platform.system() == "Windows" else ""
+    exe_file = STAN_CACHE_PATH / source_hash / f"{model_path.stem}{exe_suffix}"
+
+    if exe_file.exists():
+        return cmdstanpy.CmdStanModel(
+            stan_file=model_path, exe_file=exe_file, cpp_options=cpp_options
+        )
+
+    model = cmdstanpy.CmdStanModel(stan_file=model_path, cpp_options=cpp_options)
+    exe_file.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(model.exe_file, exe_file)
+
+    return model
+
+
+def _stan_sources(model_path: Path) -> list[Path]:
+    """
+    List a Stan file followed by the files it ``#include``s, recursively.
+
+    Includes are resolved relative to the including file's directory, as
+    stanc does by default.
+    """
+    sources = [model_path]
+    for line in model_path.read_text().splitlines():
+        line = line.strip()
+        if line.startswith("#include"):
+            name = line.removeprefix("#include").strip().strip("<>\"'")
+            sources.extend(_stan_sources(model_path.parent / name))
+
+    return sources
+
+
+def save_draws(df_fit: pd.DataFrame, run_name: Path | str, stan_data: dict) -> Path:
+    """
+    Save raw and aligned posterior draws for a latent space model.
+
+    Aligns the person and item latent coordinates across chains using
+    Procrustes analysis and writes both the raw and aligned draws to parquet.
+
+    Parameters
+    ----------
+    df_fit : pd.DataFrame
+        Posterior draws with a ``chain__`` column and latent parameters named
+        ``xi[i,d]`` and ``zt_centered[i,d]``.
+    run_name : Path or str
+        Name for the output directory and result files.
+    stan_data : dict
+        Dictionary of data passed to the model. Must contain ``n_persons``,
+        ``n_items``, and ``D``.
+
+    Returns
+    -------
+    Path
+        Directory the results were written to.
+
+    .. Note::
+        - If ``RESULTS_PATH / run_name`` already exists, results are written
+          to ``RESULTS_PATH / f"{run_name}_{timestamp}"`` instead.
+    """
     run_path = RESULTS_PATH / run_name
     if run_path.exists():
         timestamp = time.strftime("%Y%m%d-%H%M")
-        run_path = RESULTS_PATH / f"ls-pcm_{timestamp}"
-
-    fit.save_csvfiles(dir=run_path)
+        run_path = RESULTS_PATH / f"{run_name}_{timestamp}"
+    run_path.mkdir(parents=True, exist_ok=True)
 
-    df_fit = fit.draws_pd()
-    df_fit.to_parquet(run_path / f"{run_path.name}.parquet")
+    _write_parquet(df_fit, run_path / f"{run_path.name}.parquet")
 
     # Align latent space ------ START --------------------------------
-    person_vars = [var for var in df_fit.columns if "xi[" in var]
-    item_vars = [var for var in df_fit.columns if "zt_centered[" in var]
+    df_fit_aligned = df_fit.copy(deep=False)
+    rotate.rotate_draws_inplace(
+        df_fit_aligned, stan_data["n_persons"], stan_data["n_items"], stan_data["D"]
+    )
 
-    person_draws = df_fit[["chain__"] + person_vars]
-    item_draws = df_fit[["chain__"] + item_vars]
+    _write_parquet(df_fit_aligned, run_path / f"{run_path.name}_aligned.parquet")
 
-    person_chain_coords = rotate.extract_latent_coordinates(
-        person_draws, stan_data["n_persons"], stan_data["D"], "xi"
-    )
-    item_chain_coords = rotate.extract_latent_coordinates(
-        item_draws, stan_data["n_items"], stan_data["D"], "zt_centered"
-    )
-    aligned_person_coords, aligned_item_coords = rotate.align_latent_spaces(
-        person_chain_coords, item_chain_coords
-    )
-    df_fit_aligned = rotate.create_aligned_draws_dataframe(
-        df_fit, aligned_person_coords, aligned_item_coords, D=2
+    return run_path
+
+
+def _read_draws(
+    fit: cmdstanpy.CmdStanMCMC,
+    var_names: tuple[str, ...] | None = None,
+) -> pd.DataFrame:
+    """
+    Read the requested columns from the CmdStan CSV files.
+
+    Parameters
+    ----------
+    fit : cmdstanpy.CmdStanMCMC
+        Fitted sampler output.
+    var_names : tuple of str, optional
+        Sampler or Stan variables to read. Default is ``None`` (all sampler
+        diagnostics and Stan variables except ``UNSAVED_VARS``).
+
+    Returns
+    -------
+    pd.DataFrame
+        Draws with ``chain__``, ``iter__`` and ``draw__`` columns followed by
+        the requested variables in ``draws_pd`` naming (e.g. ``xi[1,1]``).
+
+    .. Note::
+        - Unlike ``fit.draws_pd()``, the full draws array is never assembled;
+          each chain CSV is parsed for the projected columns only.
+    """
+    variables = fit.metadata.method_vars | fit.metadata.stan_vars
+    if var_names is None:
+        var_names = tuple(var for var in variables if var not in UNSAVED_VARS)
+    col_idx = sorted(
+        idx
+        for var in var_names
+        for idx in range(variables[var].start_idx, variables[var].end_idx)
     )
+    col_names = [fit.column_names[idx] for idx in col_idx]
+
+    chain_draws = []
+    for chain, csv_file in enumerate(fit.runset.csv_files, start=1):
+        df_chain = pd.read_csv(csv_file, comment="#", usecols=col_idx, dtype=np.float64)
+        df_chain.columns = col_names
+        df_chain.insert(0, "chain__", float(chain))
+        df_chain.insert(1, "iter__", np.arange(1.0, len(df_chain) + 1))
+        chain_draws.append(df_chain)
+
+    df_fit = pd.concat(chain_draws, ignore_index=True)
+    df_fit.insert(2, "draw__", np.arange(1.0, len(df_fit) + 1))
+
+    return df_fit
 
-    df_fit_aligned.to_parquet(run_path / f"{run_path.name}_aligned.parquet")
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """
+    Write a draws DataFrame to parquet as a single compressed row group.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Posterior draws to write.
+    path : Path
+        Destination parquet file.
+
+    Returns
+    -------
+    None
+
+    .. Note::
+        - Draws tables are wide (thousands of latent columns) but short, and
+          every row group repeats metadata for every column, so all rows go
+          in one row group; downstream readers load whole files anyway.
+        - Float draws rarely repeat, so dictionary encoding is disabled.
+        - Compression is zstd at level 3.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(
+        table,
+        path,
+        row_group_size=max(1, len(df)),
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=False,
+        write_statistics=True,
+    )
 
 
 if __name__ == "__main__":
+    import logging
     import sys
     from pathlib import Path
 
@@ -201,18 +400,28 @@ if __name__ == "__main__":
     RESULTS_PATH = ROOT_PATH / "results"
     MODEL_PATH = ROOT_PATH / "analysis" / "models"
 
+    # Report per-chain alignment disparities
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     df_resp = pd.read_parquet(DATA_PATH / "COTS_2025_data.parquet")
-    df_resp["max_score"] = df_resp.groupby("item_id")["score"].transform("max")
     df_resp["log_rt"] = np.log(df_resp["rt"])
 
     # Ensure 1-index for Stan
-    df_resp["person_id"] = pd.factorize(df_resp["person_id"])[0] + 1
-    df_resp["item_id"] = pd.factorize(df_resp["item_id"])[0] + 1
+    # (saved ids already run 1..n in order, so category codes preserve them)
+    person_ids = df_resp["person_id"].astype("category")
+    df_resp["person_id"] = person_ids.cat.codes.to_numpy(dtype=np.int64) + 1
+    item_ids = df_resp["item_id"].astype("category")
+    item_codes = item_ids.cat.codes.to_numpy(dtype=np.int64)
+    df_resp["item_id"] = item_codes + 1
+
+    # Per-item maximum score over the dense item codes (scores are non-negative)
+    item_max_score = np.zeros(len(item_ids.cat.categories), dtype=np.int64)
+    np.maximum.at(item_max_score, item_codes, df_resp["score"].to_numpy())
+    df_resp["max_score"] = item_max_score[item_codes]
 
     # Run LS-PCM ------ START --------------------------------
-    threshold_start = df_resp.groupby("item_id")["max_score"].first().cumsum() + 1
-    threshold_start = threshold_start.shift(1).replace(np.nan, 1).astype(int).to_numpy()
-    total_thresholds = df_resp.groupby("item_id")["max_score"].first().sum()
+    threshold_start = np.concatenate([[1], item_max_score.cumsum() + 1])[:-1]
+    total_thresholds = item_max_score.sum()
 
     stan_data = {
         "N": len(df_resp),
@@ -230,7 +439,12 @@ if __name__ == "__main__":
     }
 
     stan_model = MODEL_PATH / "ls_pcm_fixed_theta.stan"
-    # run_stan_model(model_path=stan_model, run_name="ls-pcm", stan_data=stan_data)
+    # run_stan_model(
+    #     model_path=stan_model,
+    #     run_name="ls-pcm",
+    #     stan_data=stan_data,
+    #     threads_per_chain=2,
+    # )
 
     # Run LS-LNRT ------ START --------------------------------
     stan_data = {
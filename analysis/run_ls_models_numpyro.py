@@ -0,0 +1,377 @@
+# ====================================================================
+# Author: William Muntean
+# Copyright (C) 2025 William Muntean. All rights reserved.
+#
+# Licensed under the GPL v3 License;
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/GPL v3
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ====================================================================
+
+"""
+=======================================================
+Latent Space Model Runner (NumPyro)
+=======================================================
+
+This module provides NumPyro ports of the LS-LNRT and LS-PCM (fixed theta)
+Stan models and a runner that samples them with JAX-compiled NUTS. All
+chains are vectorized into a single batched kernel, and the posterior draws
+are saved and aligned exactly as in ``analysis.run_ls_models``.
+
+Latent Space Modeling Workflow
+==============================
+
+The modeling workflow is performed in the following stages:
+
+1. **NumPyro Model Fitting**:
+
+   - Fit the LS-LNRT or LS-PCM model with NUTS using vectorized chains.
+
+2. **Draw Conversion**:
+
+   - Flatten the grouped samples into a Stan-style draws DataFrame with
+     ``chain__``, ``xi[i,d]``, and ``zt_centered[i,d]`` columns.
+
+3. **Result Saving and Alignment**:
+
+   - Save raw and aligned draws using ``analysis.run_ls_models.save_draws``.
+
+.. Note::
+    - The models mirror ``ls_lnrt.stan`` and ``ls_pcm_fixed_theta.stan``,
+      including priors and the centering of item positions.
+    - ``stan_data`` dictionaries are shared with the CmdStanPy runner, so
+      indices are 1-based on input.
+    - JAX is switched to 64-bit precision on import, matching Stan's double
+      precision sampling and saved draws.
+
+.. Important::
+    - Requires ``jax`` and ``numpyro``, which are not part of the default
+      environment (``pip install numpyro``).
+
+.. currentmodule:: analysis.run_ls_models_numpyro
+
+Functions
+=========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+    :template: function_name_only.rst
+
+    ls_lnrt_model
+    ls_pcm_model
+    run_numpyro_model
+
+Standalone Execution
+=====================
+When run as a standalone script, this module fits the LS-LNRT and LS-PCM
+models on the preprocessed dataset and outputs results to the ``results/``
+directory.
+
+.. code-block:: bash
+
+    python run_ls_models_numpyro.py
+
+- Output Files:
+    - ``ls-pcm_numpyro.parquet``
+    - ``ls-lnrt_numpyro.parquet``
+"""
+
+__author__ = "William Muntean"
+__email__ = "williamjmuntean@gmail.com"
+__license__ = "GPL v3"
+__maintainer__ = "William Muntean"
+__date__ = "2025-10-15"
+
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+import numpyro
+import numpyro.distributions as dist
+import pandas as pd
+from numpyro.infer import MCMC, NUTS
+
+# Sample in double precision like the CmdStanPy runner; must precede any JAX
+# array creation
+numpyro.enable_x64()
+
+ROOT_PATH = (
+    Path("__file__").resolve().parents[0]
+)  # 0 for .py or unsaved notebooks and 1 for .ipynb
+sys.path.append(ROOT_PATH.as_posix())
+from analysis.run_ls_models import UNSAVED_VARS, save_draws
+
+DATA_PATH = ROOT_PATH / "data"
+
+
+def _latent_positions(n_persons: int, n_items: int, D: int):
+    """
+    Sample person and item latent positions and center the item positions.
+    """
+    with numpyro.plate("items", n_items):
+        zt = numpyro.sample("zt", dist.Normal(0, 1).expand([D]).to_event(1))
+    with numpyro.plate("persons", n_persons):
+        xi = numpyro.sample("xi", dist.Normal(0, 1).expand([D]).to_event(1))
+
+    zt_centered = numpyro.deterministic("zt_centered", zt - zt.mean(axis=0))
+
+    return xi, zt_centered
+
+
+def ls_lnrt_model(stan_data: dict):
+    """
+    NumPyro Latent-Space Log-Normal Response Time (LS-LNRT) model.
+
+    Parameters
+    ----------
+    stan_data : dict
+        Dictionary of data with the same keys as ``ls_lnrt.stan``.
+
+    Returns
+    -------
+    None
+    """
+    n_items, n_persons, D = stan_data["n_items"], stan_data["n_persons"], stan_data["D"]
+    item = stan_data["item_id"] - 1
+    person = stan_data["person_id"] - 1
+
+    # --- Item Parameters ---
+    with numpyro.plate("items", n_items):
+        beta = numpyro.sample("beta", dist.Normal(0, 2))
+        log_alpha = numpyro.sample("log_alpha", dist.Normal(0, 1))
+
+    # --- Person Parameters ---
+    with numpyro.plate("persons", n_persons):
+        tau = numpyro.sample("tau", dist.Normal(0, 1))
+
+    xi, zt_centered = _latent_positions(n_persons, n_items, D)
+
+    # --- Latent Space Parameters ---
+    log_gamma = numpyro.sample("log_gamma", dist.Normal(0.5, 1))
+
+    # --- Likelihood ---
+    latent_dist = jnp.linalg.norm(xi[person] - zt_centered[item], axis=-1)
+    mu = beta[item] - tau[person] + jnp.exp(log_gamma) * latent_dist
+    sigma = jnp.exp(-log_alpha[item])
+
+    with numpyro.plate("obs", stan_data["N"]):
+        numpyro.sample("log_rt", dist.Normal(mu, sigma), obs=stan_data["log_rt"])
+
+
+def ls_pcm_model(stan_data: dict):
+    """
+    NumPyro Latent Space Partial Credit Model (LS-PCM) with fixed theta.
+
+    Parameters
+    ----------
+    stan_data : dict
+        Dictionary of data with the same keys as ``ls_pcm_fixed_theta.stan``.
+
+    Returns
+    -------
+    None
+
+    .. Note::
+        - Item thresholds are stored in one flat vector; entries beyond an
+          item's number of categories are masked out of the category logits.
+    """
+    n_items, n_persons, D = stan_data["n_items"], stan_data["n_persons"], stan_data["D"]
+    max_categories = stan_data["max_categories"]
+    item = stan_data["item_id"] - 1
+    person = stan_data["person_id"] - 1
+    n_cats = stan_data["categories_per_item"]
+
+    # --- Item Parameters ---
+    with numpyro.plate("thresholds", stan_data["total_thresholds"]):
+        threshold = numpyro.sample("threshold", dist.Normal(0, 2))
+
+    xi, zt_centered = _latent_positions(n_persons, n_items, D)
+
+    # --- Latent Space Parameters ---
+    log_gamma = numpyro.sample("log_gamma", dist.Normal(0.5, 1))
+
+    # --- Likelihood ---
+    latent_dist = jnp.linalg.norm(xi[person] - zt_centered[item], axis=-1)
+    effective_theta = stan_data["theta"] - jnp.exp(log_gamma) * latent_dist
+
+    steps = jnp.arange(max_categories - 1)
+    threshold_idx = stan_data["threshold_start"][item][:, None] - 1 + steps
+    threshold_idx = jnp.minimum(threshold_idx, stan_data["total_thresholds"] - 1)
+    valid_step = steps < (n_cats[:, None] - 1)
+
+    step_eta = jnp.where(
+        valid_step, effective_theta[:, None] - threshold[threshold_idx], 0.0
+    )
+    eta = jnp.concatenate(
+        [jnp.zeros((stan_data["N"], 1)), jnp.cumsum(step_eta, axis=1)], axis=1
+    )
+    eta = jnp.where(
+        jnp.arange(max_categories) < n_cats[:, None], eta, jnp.finfo(eta.dtype).min
+    )
+
+    with numpyro.plate("obs", stan_data["N"]):
+        numpyro.sample(
+            "scores", dist.Categorical(logits=eta), obs=stan_data["scores"] - 1
+        )
+
+
+def _draws_dataframe(samples: dict, diverging: np.ndarray) -> pd.DataFrame:
+    """
+    Flatten chain-grouped NumPyro samples into a Stan-style draws DataFrame.
+
+    Sites in ``UNSAVED_VARS`` are skipped, as in the CmdStanPy runner.
+    """
+    n_chains, n_draws = diverging.shape
+
+    columns = {
+        "chain__": np.repeat(np.arange(1, n_chains + 1), n_draws),
+        "iter__": np.tile(np.arange(1, n_draws + 1), n_chains),
+        "draw__": np.arange(1, n_chains * n_draws + 1),
+        "divergent__": diverging.reshape(-1).astype(float),
+    }
+    for name, values in samples.items():
+        if name in UNSAVED_VARS:
+            continue
+        shape = np.shape(values)[2:]
+        values = np.asarray(values, dtype=np.float64).reshape(n_chains * n_draws, -1)
+        if not shape:
+            columns[name] = values[:, 0]
+            continue
+        for k, idx in enumerate(np.ndindex(shape)):
+            columns[f"{name}[{','.join(str(i + 1) for i in idx)}]"] = values[:, k]
+
+    return pd.DataFrame(columns)
+
+
+def run_numpyro_model(
+    model: Callable[[dict], None],
+    run_name: Path | str,
+    stan_data: dict,
+    num_warmup: int = 100,
+    num_samples: int = 800,
+    num_chains: int = 4,
+    dense_mass: bool = False,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Fit a NumPyro latent space model and save results.
+
+    Samples the model with NUTS, running all chains as one vectorized
+    kernel, then saves raw and aligned outputs using ``save_draws``.
+
+    Parameters
+    ----------
+    model : Callable[[dict], None]
+        NumPyro model, e.g. ``ls_lnrt_model`` or ``ls_pcm_model``.
+    run_name : Path or str
+        Name for the output directory and result files.
+    stan_data : dict
+        Dictionary of model data using the CmdStanPy runner's keys.
+    num_warmup : int, optional
+        Number of warmup iterations per chain. Default is 100.
+    num_samples : int, optional
+        Number of sampling iterations per chain. Default is 800.
+    num_chains : int, optional
+        Number of chains. Default is 4.
+    dense_mass : bool, optional
+        Adapt a dense mass matrix. Default is ``False``, matching Stan's
+        ``diag_e`` metric; the dense matrix grows quadratically with the
+        number of latent positions.
+    seed : int, optional
+        Seed for ``jax.random.PRNGKey``. Default is 0.
+
+    Returns
+    -------
+    pd.DataFrame
+        Raw posterior draws in Stan ``draws_pd`` layout.
+    """
+    data = {
+        key: jnp.asarray(value) if isinstance(value, np.ndarray) else value
+        for key, value in stan_data.items()
+    }
+
+    kernel = NUTS(model, dense_mass=dense_mass)
+    mcmc = MCMC(
+        kernel,
+        num_warmup=num_warmup,
+        num_samples=num_samples,
+        num_chains=num_chains,
+        chain_method="vectorized",
+    )
+    mcmc.run(jax.random.PRNGKey(seed), data, extra_fields=("diverging",))
+
+    df_fit = _draws_dataframe(
+        mcmc.get_samples(group_by_chain=True),
+        np.asarray(mcmc.get_extra_fields(group_by_chain=True)["diverging"]),
+    )
+    save_draws(df_fit, run_name, stan_data)
+
+    return df_fit
+
+
+if __name__ == "__main__":
+    import logging
+
+    # Report per-chain alignment disparities
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    df_resp = pd.read_parquet(DATA_PATH / "COTS_2025_data.parquet")
+    df_resp["log_rt"] = np.log(df_resp["rt"])
+
+    # Ensure 1-index to share stan_data layout
+    # (saved ids already run 1..n in order, so category codes preserve them)
+    person_ids = df_resp["person_id"].astype("category")
+    df_resp["person_id"] = person_ids.cat.codes.to_numpy(dtype=np.int64) + 1
+    item_ids = df_resp["item_id"].astype("category")
+    item_codes = item_ids.cat.codes.to_numpy(dtype=np.int64)
+    df_resp["item_id"] = item_codes + 1
+
+    # Per-item maximum score over the dense item codes (scores are non-negative)
+    item_max_score = np.zeros(len(item_ids.cat.categories), dtype=np.int64)
+    np.maximum.at(item_max_score, item_codes, df_resp["score"].to_numpy())
+    df_resp["max_score"] = item_max_score[item_codes]
+
+    # Run LS-PCM ------ START --------------------------------
+    threshold_start = np.concatenate([[1], item_max_score.cumsum() + 1])[:-1]
+    total_thresholds = item_max_score.sum()
+
+    stan_data = {
+        "N": len(df_resp),
+        "item_id": df_resp["item_id"].to_numpy(),
+        "person_id": df_resp["person_id"].to_numpy(),
+        "theta": df_resp["op_theta"].to_numpy(),
+        "scores": (df_resp["score"] + 1).to_numpy(),
+        "categories_per_item": (df_resp["max_score"] + 1).to_numpy(),
+        "n_items": df_resp["item_id"].nunique(),
+        "threshold_start": threshold_start,
+        "total_thresholds": int(total_thresholds),
+        "max_categories": int(df_resp["max_score"].max() + 1),
+        "n_persons": df_resp["person_id"].nunique(),
+        "D": 2,
+    }
+
+    run_numpyro_model(ls_pcm_model, run_name="ls-pcm_numpyro", stan_data=stan_data)
+
+    # Run LS-LNRT ------ START --------------------------------
+    stan_data = {
+        "N": len(df_resp),
+        "n_items": df_resp["item_id"].nunique(),
+        "n_persons": df_resp["person_id"].nunique(),
+        "D": 2,
+        "item_id": df_resp["item_id"].to_numpy(),
+        "person_id": df_resp["person_id"].to_numpy(),
+        "log_rt": df_resp["log_rt"].to_numpy(),
+    }
+
+    run_numpyro_model(ls_lnrt_model, run_name="ls-lnrt_numpyro", stan_data=stan_data)
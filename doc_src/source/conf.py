@@ -43,7 +43,7 @@ extensions = [
     "sphinx_design",
 ]
 
-# autodoc_mock_imports = ['packages']
+autodoc_mock_imports = ["jax", "numpyro"]
 autosummary_ignore_module_all = False
 add_module_names = False
 add_function_parentheses = False
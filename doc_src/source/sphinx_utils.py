@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import shutil
 import subprocess
 from pathlib import Path
@@ -61,6 +62,8 @@ def copy_collections(
     .. Note::
         - If the target directory exists and is up-to-date, copying is skipped.
         - The ``ignore`` patterns use the same syntax as ``shutil.ignore_patterns``.
+        - Files are hardlinked into the target when possible; a regular copy is
+          used if linking fails (e.g., across filesystems).
 
     .. Warning::
         Use with caution: all contents of the target directory will be removed prior to copying if update is needed.
@@ -97,7 +100,13 @@ def copy_collections(
             if verbose:
                 print(f"[copy_collections] Removed existing: {dst}")
 
-        shutil.copytree(src, dst, ignore=ignore_patterns)
+        try:
+            # Hardlink files instead of copying their contents
+            shutil.copytree(src, dst, ignore=ignore_patterns, copy_function=os.link)
+        except OSError:
+            # Hardlinks fail across filesystems; fall back to a full copy
+            shutil.rmtree(dst, ignore_errors=True)
+            shutil.copytree(src, dst, ignore=ignore_patterns)
         _copied_targets.append(dst)
         if verbose:
             print(f"[copy_collections] Copied {src} → {dst}")
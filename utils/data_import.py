@@ -115,10 +115,12 @@ __date__ = "2025-08-22"
 
 import sys
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
 from pathlib import Path
 from zipfile import ZipFile
 
+import numpy as np
 import pandas as pd
 import yaml
 
@@ -127,6 +129,26 @@ ROOT_PATH = (
 )  # 0 for .py or unsaved notebooks and 1 for .ipynb
 sys.path.append(ROOT_PATH.as_posix())
 
+# Marker identifying exhibit (feedback) event ids, matched case-insensitively
+_FEEDBACK_MARKER = "-feedback"
+
+
+@cache
+def _load_xml_config() -> tuple[str, str]:
+    """
+    Load ``utils/config.yaml`` once and return the fully qualified event tag
+    and the person ID path.
+    """
+    with open(ROOT_PATH / "utils" / "config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+    ns = {config["xml"]["prefix"]: config["xml"]["namespace"]}
+    person_var = config["person"]["var"]
+
+    # Unprefixed path tags resolve to the default namespace, if one is set
+    event_tag = f"{{{ns['']}}}event" if ns.get("") else "event"
+
+    return event_tag, person_var
+
 
 def parse_process_data(xml_file):
     """
@@ -145,102 +167,93 @@ def parse_process_data(xml_file):
         interaction data.
 
         - ``person_id``: Person identifier.
-        - ``items``: List of dictionaries with item interaction metrics.
+        - ``items``: List of dictionaries with item interaction metrics
+          (``item_id``, ``interaction_count``, ``exhibit_interaction_count``,
+          ``has_exhibit``, ``response_selections``, ``response_changes``,
+          ``time_spent_seconds``).
+
+    .. Note::
+        - Events whose ``id`` contains ``-feedback`` (any case) count as
+          exhibit interactions; all others count as regular interactions.
+        - ``response_changes`` counts ``responseSelected`` events with
+          ``status="off"``.
     """
-    # Parse the XML file
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    event_tag, person_var = _load_xml_config()
 
-    # Define namespace
-    with open(ROOT_PATH / "utils" / "config.yaml", "r") as f:
-        config = yaml.safe_load(f)
-    ns = {config["xml"]["prefix"]: config["xml"]["namespace"]}
-    person_var = config["person"]["var"]
+    # Stream the XML file into event attribute columns, freeing each event
+    events = {"action": [], "id": [], "status": [], "time": []}
+
+    root = None
+    parents = []
+    for xml_event, elem in ET.iterparse(xml_file, events=("start", "end")):
+        if xml_event == "start":
+            if root is None:
+                root = elem
+            parents.append(elem)
+            continue
+
+        parents.pop()
+        if elem.tag != event_tag or not parents:
+            continue
+
+        for attr, values in events.items():
+            values.append(elem.get(attr))
+
+        elem.clear()
+        parents[-1].remove(elem)
 
     # Extract person ID
     person_id = root.find(person_var).text
 
-    # Initialize variables
-    items_data = []
-    current_item = None
-    item_start_time = None
-    interactions = []
-    exhibit_interactions = []
-
-    # Process all events
-    for event in root.findall(".//event", ns):
-        action = event.get("action")
-        event_time = datetime.fromisoformat(event.get("time").replace("Z", "+00:00"))
-        event_id = event.get("id")
-
-        # Track item entry
-        if action == "itemEntered":
-            # Save previous item data if exists
-            if current_item:
-                time_spent = (event_time - item_start_time).total_seconds()
-                items_data.append(
-                    {
-                        "item_id": current_item,
-                        "interaction_count": len(interactions),
-                        "exhibit_interaction_count": len(exhibit_interactions),
-                        "has_exhibit": len(exhibit_interactions) > 0,
-                        "response_changes": sum(
-                            1
-                            for i in interactions
-                            if i.get("action") == "responseSelected"
-                            and "-FEEDBACK" not in i.get("id", "")
-                        ),
-                        "time_spent_seconds": time_spent,
-                        "interactions": interactions,
-                        "exhibit_interactions": exhibit_interactions,
-                    }
-                )
-
-            # Start tracking new item
-            current_item = event_id
-            item_start_time = event_time
-            interactions = []
-            exhibit_interactions = []
-
-        # Track all interactions within the current item
-        if current_item:
-            interaction_data = {
-                "action": action,
-                "time": event_time,
-                "id": event_id,
-                "status": event.get("status"),
-                "choice": event.get("choice"),
-                "response_type": event.get("responseType"),
-            }
-
-            # Separate exhibit interactions from regular interactions
-            if event_id:
-                if "-feedback" in event_id.lower():
-                    exhibit_interactions.append(interaction_data)
-                else:
-                    interactions.append(interaction_data)
-            else:
-                interactions.append(interaction_data)
-
-    # Add the last item
-    if current_item:
-        items_data.append(
-            {
-                "item_id": current_item,
-                "interaction_count": len(interactions),
-                "exhibit_interaction_count": len(exhibit_interactions),
-                "has_exhibit": len(exhibit_interactions) > 0,
-                "response_changes": sum(
-                    1
-                    for i in interactions
-                    if i.get("action") == "responseSelected"
-                    and "-FEEDBACK" not in i.get("id", "")
-                ),
-                "time_spent_seconds": 0,  # Can't calculate for last item
-                "interactions": interactions,
-                "exhibit_interactions": exhibit_interactions,
-            }
-        )
+    actions = np.asarray(events["action"], dtype=object)
+    statuses = np.asarray(events["status"], dtype=object)
+    event_ids = pd.Series(events["id"], dtype=object)
+
+    # Assign each event to the most recently entered item (-1 before any item)
+    entered = actions == "itemEntered"
+    entry_idx = np.flatnonzero(entered)
+    item_pos = np.cumsum(entered) - 1
+    n_entries = len(entry_idx)
+
+    # Items entered without an id are not tracked
+    item_ids = event_ids.iloc[entry_idx].tolist()
+    is_tracked = np.array([bool(item_id) for item_id in item_ids], dtype=bool)
+    in_item = item_pos >= 0
+    in_item[in_item] = is_tracked[item_pos[in_item]]
+
+    # Separate exhibit interactions from regular interactions
+    is_exhibit = event_ids.str.contains(
+        _FEEDBACK_MARKER, case=False, regex=False, na=False
+    ).to_numpy(dtype=bool)
+    is_regular = in_item & ~is_exhibit
+    is_selection = is_regular & (actions == "responseSelected")
+    # A response change is a selection being turned off
+    is_change = is_selection & (statuses == "off")
+
+    interaction_count = np.bincount(item_pos[is_regular], minlength=n_entries)
+    exhibit_count = np.bincount(item_pos[in_item & is_exhibit], minlength=n_entries)
+    selection_count = np.bincount(item_pos[is_selection], minlength=n_entries)
+    change_count = np.bincount(item_pos[is_change], minlength=n_entries)
+
+    # Time spent runs until the next item is entered; the last item has none
+    entry_times = pd.to_datetime(
+        [events["time"][j] for j in entry_idx], utc=True, format="ISO8601"
+    ).to_numpy()
+    time_spent = np.zeros(n_entries)
+    time_spent[:-1] = np.diff(entry_times) / np.timedelta64(1, "s")
+
+    items_data = [
+        {
+            "item_id": item_ids[k],
+            "interaction_count": int(interaction_count[k]),
+            "exhibit_interaction_count": int(exhibit_count[k]),
+            "has_exhibit": bool(exhibit_count[k] > 0),
+            "response_selections": int(selection_count[k]),
+            "response_changes": int(change_count[k]),
+            "time_spent_seconds": float(time_spent[k]),
+        }
+        for k in np.flatnonzero(is_tracked)
+    ]
 
     return {"person_id": person_id, "items": items_data}
 
@@ -267,46 +280,68 @@ def clean_parsed_data(parsed_data):
         - ``response_changes``: Number of response changes.
         - ``time_spent_seconds``: Time spent on item.
     """
-    rows = []
-
-    for item in parsed_data["items"]:
-        # Count specific interaction types
-        response_selections = sum(
-            1 for i in item["interactions"] if i["action"] == "responseSelected"
-        )
+    items = parsed_data["items"]
+    n_items = len(items)
+
+    item_ids = np.empty(n_items, dtype=object)
+    total_interactions = np.empty(n_items, dtype=np.int64)
+    exhibit_interactions = np.empty(n_items, dtype=np.int64)
+    has_exhibit = np.empty(n_items, dtype=np.bool_)
+    response_selections = np.empty(n_items, dtype=np.int64)
+    response_changes = np.empty(n_items, dtype=np.int64)
+    time_spent_seconds = np.empty(n_items, dtype=np.float64)
+
+    for k, item in enumerate(items):
+        item_ids[k] = item["item_id"]
+        total_interactions[k] = item["interaction_count"]
+        exhibit_interactions[k] = item["exhibit_interaction_count"]
+        has_exhibit[k] = item["has_exhibit"]
+        response_selections[k] = item["response_selections"]
+        response_changes[k] = item["response_changes"]
+        time_spent_seconds[k] = item["time_spent_seconds"]
+
+    return pd.DataFrame(
+        {
+            "person_id": parsed_data["person_id"],
+            "item_id": item_ids,
+            "total_interactions": total_interactions,
+            "exhibit_interactions": exhibit_interactions,
+            "has_exhibit": has_exhibit,
+            "response_selections": response_selections,
+            "response_changes": response_changes,
+            "time_spent_seconds": time_spent_seconds,
+        },
+        index=pd.RangeIndex(n_items),
+    )
 
-        # Count response changes (when a selection is turned off)
-        response_changes = sum(
-            1
-            for i in item["interactions"]
-            if i["action"] == "responseSelected" and i.get("status") == "off"
-        )
 
-        rows.append(
-            {
-                "person_id": parsed_data["person_id"],
-                "item_id": item["item_id"],
-                "total_interactions": item["interaction_count"],
-                "exhibit_interactions": item["exhibit_interaction_count"],
-                "has_exhibit": item["has_exhibit"],
-                "response_selections": response_selections,
-                "response_changes": response_changes,
-                "time_spent_seconds": item["time_spent_seconds"],
-            }
-        )
+def _process_one_zip(zip_path: Path) -> pd.DataFrame | None:
+    """
+    Parse and clean the interaction XML inside a single zip file.
 
-    return pd.DataFrame(rows)
+    Returns ``None`` if the archive has no ``3.exam.interaction.xml``.
+    """
+    with ZipFile(zip_path) as zf:
+        if "3.exam.interaction.xml" not in zf.namelist():
+            return None
+        with zf.open("3.exam.interaction.xml") as xml_file:
+            parsed = parse_process_data(xml_file)
+    return clean_parsed_data(parsed)
 
 
-def batch_process_zip(process_path: Path) -> pd.DataFrame:
+def batch_process_zip(
+    process_path: Path, max_workers: int | None = None
+) -> pd.DataFrame:
     """
     Unzips each file matching ``*.zip`` in ``process_path`` and processes
     the xml file inside.
 
     Parameters
     ----------
-    uih_path : Path
+    process_path : Path
         Path to the directory containing zip files.
+    max_workers : int or None, optional
+        Number of worker processes. Default is ``None`` (one per CPU).
 
     Returns
     -------
@@ -321,15 +356,14 @@ def batch_process_zip(process_path: Path) -> pd.DataFrame:
         - ``response_selections``: Number of response selections.
         - ``response_changes``: Number of response changes.
         - ``time_spent_seconds``: Time spent on item.
+
+    .. Note::
+        - Zip files are processed independently in a process pool; results
+          are concatenated in ``glob`` order.
     """
-    dfs = []
-    for zip_file in process_path.glob("*.zip"):
-        with ZipFile(zip_file) as zf:
-            if "3.exam.interaction.xml" in zf.namelist():
-                with zf.open("3.exam.interaction.xml") as xml_file:
-                    parsed = parse_process_data(xml_file)
-                    df = clean_parsed_data(parsed)
-                    dfs.append(df)
+    zip_files = list(process_path.glob("*.zip"))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        dfs = [df for df in executor.map(_process_one_zip, zip_files) if df is not None]
     if dfs:
         df = pd.concat(dfs, ignore_index=True)
         return df
@@ -359,23 +393,33 @@ def collapse_scores_equal_freq(
         DataFrame with collapsed score (0, 1, or 2) replacing score_col name.
     """
     df = df.copy()
-
-    def bin_scores(s: pd.Series) -> pd.Series:
-        if s.nunique() <= 3:
-            # Already 3 or fewer unique scores, keep as is
-            return s
-        try:
-            return pd.qcut(s, q=3, labels=False, duplicates="drop")
-        except ValueError:
-            return s
-
-    df[score_col] = df.groupby(item_col)[score_col].transform(bin_scores)
+    scores = df[score_col]
+    grouped = df.groupby(item_col, observed=True)[score_col]
+
+    n_unique = grouped.transform("nunique")
+    lowest = grouped.transform("min")
+    highest = grouped.transform("max")
+    q1 = grouped.transform("quantile", 1 / 3)
+    q2 = grouped.transform("quantile", 2 / 3)
+
+    # Equal-frequency bins as in ``pd.qcut(q=3, duplicates="drop")``: each
+    # distinct interior edge raises the category of scores above it
+    q1_edge = (q1 > lowest) & (q1 < highest)
+    q2_edge = (q2 > lowest) & (q2 < highest) & (q2 != q1)
+    above_q1 = q1_edge & (scores > q1)
+    above_q2 = q2_edge & (scores > q2)
+    collapsed = above_q1.astype(int) + above_q2.astype(int)
+
+    # Items with 3 or fewer unique scores are kept as is
+    df[score_col] = np.where(n_unique > 3, collapsed, scores)
     return df
 
 
 if __name__ == "__main__":
     import sys
 
+    import pyarrow.csv as pacsv
+
     ROOT_PATH = (
         Path("__file__").resolve().parents[0]
     )  # 0 for .py or unsaved notebooks and 1 for .ipynb
@@ -388,18 +432,25 @@ if __name__ == "__main__":
     df_process = batch_process_zip(process_path)
 
     # Clean Response Data
-    df_response = pd.read_csv(DATA_PATH / "Scored_2104_RN_ENU.csv.zip")
-    df_response = df_response[
-        [
-            "RegistrationID",
-            "Identifier_Item",
-            "TimeSpent_Sec",
-            "FinalTheta",
-            "ItemSetID",
-            "ItemType",
-            "ScorePts",
-        ]
+    # Parse only the needed columns straight out of the archive
+    score_columns = [
+        "RegistrationID",
+        "Identifier_Item",
+        "TimeSpent_Sec",
+        "FinalTheta",
+        "ItemSetID",
+        "ItemType",
+        "ScorePts",
     ]
+    with (
+        ZipFile(DATA_PATH / "Scored_2104_RN_ENU.csv.zip") as zf,
+        zf.open(zf.namelist()[0]) as csv_file,
+    ):
+        table = pacsv.read_csv(
+            csv_file,
+            convert_options=pacsv.ConvertOptions(include_columns=score_columns),
+        )
+    df_response = table.to_pandas()
 
     df_response = df_response.rename(
         columns={
@@ -422,19 +473,25 @@ if __name__ == "__main__":
         how="inner",
     )
 
+    # Categorical ids let the per-item steps below work on integer codes
+    for id_col in ["person_id", "item_id"]:
+        df[id_col] = pd.Categorical(df[id_col], categories=df[id_col].unique())
+
     # Clean process data error
-    mean_exhibit_interactions = df.groupby("item_id")["exhibit_interactions"].transform(
-        "mean"
-    )
-    mask = mean_exhibit_interactions > 0.009
+    item_codes = df["item_id"].cat.codes.to_numpy()
+    mean_exhibit_interactions = np.bincount(
+        item_codes, weights=df["exhibit_interactions"].to_numpy()
+    ) / np.bincount(item_codes)
+    mask = mean_exhibit_interactions[item_codes] > 0.009
     df.loc[mask, "has_exhibit"] = True
     df.loc[~mask, "exhibit_interactions"] = 0
     df["score"] = df["score"].astype(int)
     df = collapse_scores_equal_freq(df)
     df = df[df["item_type"] != "Drop_Cloze"]
 
-    df["person_id"] = pd.factorize(df["person_id"])[0] + 1
-    df["item_id"] = pd.factorize(df["item_id"])[0] + 1
+    # 1-based ids in order of first appearance, factorized on the integer codes
+    df["person_id"] = pd.factorize(df["person_id"].cat.codes)[0] + 1
+    df["item_id"] = pd.factorize(df["item_id"].cat.codes)[0] + 1
     df["itemset_id"] = pd.factorize(df["itemset_id"])[0] + 1
     df["itemset_id"] = df["itemset_id"].replace(-1, pd.NA)
 
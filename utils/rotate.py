@@ -46,6 +46,8 @@ The alignment process is performed in the following stages:
 
 .. Note::
     - All alignment is performed in-place on copies of the original draws.
+    - ``rotate_draws_inplace`` fuses the three stages into a single pass over
+      the latent columns.
     - Functions assume Stan output format with ``chain__`` column and parameter
       names in ``prefix[i,d]`` format.
 
@@ -63,9 +65,12 @@ Functions
     :nosignatures:
     :template: function_name_only.rst
 
+    chain_row_indices
+    extract_latent_blocks
     extract_latent_coordinates
     align_latent_spaces
     create_aligned_draws_dataframe
+    rotate_draws_inplace
 """
 
 __author__ = "William Muntean"
@@ -74,13 +79,103 @@ __license__ = "GPL v3"
 __maintainer__ = "William Muntean"
 __date__ = "2025-08-29"
 
+import logging
+
 import numpy as np
 import pandas as pd
-from scipy.spatial import procrustes
+
+logger = logging.getLogger(__name__)
+
+
+def chain_row_indices(df_draws: pd.DataFrame) -> dict[int, np.ndarray]:
+    """
+    Map each chain ID to the row positions of its draws.
+
+    Parameters
+    ----------
+    df_draws : pd.DataFrame
+        DataFrame containing Stan draws with ``chain__`` column.
+
+    Returns
+    -------
+    dict[int, np.ndarray]
+        Dictionary mapping chain IDs, in sorted order, to integer row
+        positions.
+
+    .. Note::
+        - Compute once and pass as ``chain_rows`` to
+          ``extract_latent_coordinates`` and ``create_aligned_draws_dataframe``
+          to avoid rescanning ``chain__`` in each call.
+    """
+    codes, chain_ids = pd.factorize(df_draws["chain__"].to_numpy(), sort=True)
+
+    # A stable sort by code groups each chain's rows while keeping draw order
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=len(chain_ids))
+
+    return dict(zip(chain_ids, np.split(order, np.cumsum(counts)[:-1])))
+
+
+def extract_latent_blocks(
+    df_draws: pd.DataFrame, prefix: str, n_entities: int, D: int
+) -> tuple[np.ndarray, list[str]]:
+    """
+    Extract latent parameter columns as one contiguous array.
+
+    Parameters
+    ----------
+    df_draws : pd.DataFrame
+        DataFrame containing Stan draws.
+    prefix : str
+        Parameter prefix (e.g., 'xi' or 'zt_centered').
+    n_entities : int
+        Number of entities (persons or items).
+    D : int
+        Number of latent dimensions.
+
+    Returns
+    -------
+    tuple[np.ndarray, list[str]]
+        C-contiguous float64 array of shape (n_draws, n_entities * D) and the
+        matching column names.
+
+    .. Note::
+        - Columns are ordered ``prefix[1,1], ..., prefix[1,D], prefix[2,1], ...``
+          so ``block.reshape(n_draws, n_entities, D)`` recovers the
+          coordinate matrices of each draw.
+    """
+    col_idx = _param_index(df_draws, prefix, n_entities, D).ravel()
+    if np.any(col_idx < 0):
+        raise KeyError(f"Missing {prefix} columns for {n_entities} x {D} coordinates")
+
+    block = np.ascontiguousarray(df_draws.iloc[:, col_idx].to_numpy(dtype=np.float64))
+    cols = df_draws.columns[col_idx].tolist()
+
+    return block, cols
+
+
+def _param_index(
+    df_draws: pd.DataFrame, prefix: str, n_entities: int, D: int
+) -> np.ndarray:
+    """
+    Column positions of ``prefix[i,d]`` as an (n_entities, D) int64 array.
+
+    Uses a single ``Index.get_indexer`` lookup; absent columns are -1.
+    """
+    param_names = [
+        f"{prefix}[{i + 1},{d + 1}]" for i in range(n_entities) for d in range(D)
+    ]
+    col_idx = df_draws.columns.get_indexer(param_names)
+
+    return col_idx.astype(np.int64).reshape(n_entities, D)
 
 
 def extract_latent_coordinates(
-    df_draws: pd.DataFrame, n_entities: int, D: int, prefix: str
+    df_draws: pd.DataFrame,
+    n_entities: int,
+    D: int,
+    prefix: str,
+    chain_rows: dict[int, np.ndarray] | None = None,
 ) -> dict[int, np.ndarray]:
     """
     Extract and reshape latent coordinates from Stan draws by chain.
@@ -95,35 +190,55 @@ def extract_latent_coordinates(
         Number of latent dimensions.
     prefix : str
         Parameter prefix (e.g., 'xi' or 'zt_centered').
+    chain_rows : dict[int, np.ndarray] or None, optional
+        Row positions by chain from ``chain_row_indices``. Computed if None.
 
     Returns
     -------
     dict[int, np.ndarray]
         Dictionary mapping chain IDs to (n_entities, D) coordinate matrices.
-    """
-    chain_means = {}
 
-    for chain_id in df_draws["chain__"].unique():
-        chain_df = df_draws[df_draws["chain__"] == chain_id]
-        mean_params = chain_df.drop(columns="chain__").mean()
+    .. Note::
+        - The latent columns are read once with ``extract_latent_blocks``
+          and all chain means come from a single ``np.add.reduceat`` pass
+          over the chain-ordered block.
+    """
+    if chain_rows is None:
+        chain_rows = chain_row_indices(df_draws)
 
-        # Reshape into matrix
-        matrix = np.zeros((n_entities, D))
-        for i in range(n_entities):
-            for d in range(D):
-                param_name = f"{prefix}[{i + 1},{d + 1}]"
-                matrix[i, d] = mean_params[param_name]
+    block, _ = extract_latent_blocks(df_draws, prefix, n_entities, D)
+    means = _chain_means(block, chain_rows)
 
-        chain_means[chain_id] = matrix
+    chain_means = {
+        chain_id: mean.reshape(n_entities, D)
+        for chain_id, mean in zip(chain_rows, means)
+    }
 
     return chain_means
 
 
+def _chain_means(block: np.ndarray, chain_rows: dict[int, np.ndarray]) -> np.ndarray:
+    """
+    Average the rows of a 2D block by chain with a single ``np.add.reduceat``.
+
+    Returns an array with one row per chain, in ``chain_rows`` order.
+    """
+    # Group rows by chain; draws written chain by chain need no reordering
+    order = np.concatenate(list(chain_rows.values()))
+    if not np.array_equal(order, np.arange(len(block))):
+        block = block[order]
+    counts = np.array([len(rows) for rows in chain_rows.values()])
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    return np.add.reduceat(block, starts, axis=0) / counts[:, None]
+
+
 def align_latent_spaces(
     person_coords: dict[int, np.ndarray],
     item_coords: dict[int, np.ndarray],
     ref_chain_id: int = 1,
-) -> tuple[dict[int, np.ndarray], dict[int, np.ndarray]]:
+    return_transforms: bool = False,
+) -> tuple[dict[int, np.ndarray], ...]:
     """
     Align latent spaces across chains using Procrustes analysis.
 
@@ -135,42 +250,120 @@ def align_latent_spaces(
         Item coordinates by chain.
     ref_chain_id : int, optional
         Reference chain ID for alignment. Default is 1.
+    return_transforms : bool, optional
+        If True, also return the per-chain alignment transforms. Default is
+        False.
 
     Returns
     -------
-    tuple[dict[int, np.ndarray], dict[int, np.ndarray]]
-        Aligned person and item coordinates by chain.
+    tuple[dict[int, np.ndarray], ...]
+        Aligned person and item coordinates by chain, followed by the
+        transforms by chain if ``return_transforms`` is True. Each transform
+        is a ``(center, matrix)`` pair with shapes (1, D) and (D, D) such
+        that ``(coords - center) @ matrix`` gives the aligned coordinates.
+
+    .. Note::
+        - Equivalent to ``scipy.spatial.procrustes``: each chain is centered,
+          scaled to unit Frobenius norm, rotated (reflections allowed) and
+          rescaled onto the standardized reference. The reference is
+          standardized once and all chains share a single batched SVD.
+        - The transforms fold centering, scaling and rotation into one affine
+          map and can be passed to ``create_aligned_draws_dataframe`` to align
+          individual draws. The reference chain maps to the identity.
     """
-    # Create reference matrix
-    reference_matrix = np.vstack(
-        [person_coords[ref_chain_id], item_coords[ref_chain_id]]
-    )
-
-    aligned_person_coords = {ref_chain_id: person_coords[ref_chain_id]}
-    aligned_item_coords = {ref_chain_id: item_coords[ref_chain_id]}
-
+    chain_ids = list(person_coords)
     n_persons = person_coords[ref_chain_id].shape[0]
 
-    for chain_id in person_coords.keys():
-        if chain_id == ref_chain_id:
-            continue
+    n_items, D = item_coords[ref_chain_id].shape
+
+    # Fill one (n_chains, n_persons + n_items, D) buffer in place rather than
+    # stacking a fresh vstack per chain
+    coords = np.empty((len(chain_ids), n_persons + n_items, D))
+    for pos, chain_id in enumerate(chain_ids):
+        coords[pos, :n_persons] = person_coords[chain_id]
+        coords[pos, n_persons:] = item_coords[chain_id]
+    aligned, centers, matrices = _align_chains(coords, chain_ids, ref_chain_id)
+
+    # Split back into person and item parts, reference chain first
+    aligned_person_coords = {}
+    aligned_item_coords = {}
+    ref_pos = chain_ids.index(ref_chain_id)
+    for pos in [ref_pos] + [k for k in range(len(chain_ids)) if k != ref_pos]:
+        aligned_person_coords[chain_ids[pos]] = aligned[pos, :n_persons, :]
+        aligned_item_coords[chain_ids[pos]] = aligned[pos, n_persons:, :]
+
+    if return_transforms:
+        transforms = {
+            chain_id: (centers[pos], matrices[pos])
+            for pos, chain_id in enumerate(chain_ids)
+        }
+        return aligned_person_coords, aligned_item_coords, transforms
+
+    return aligned_person_coords, aligned_item_coords
 
-        # Combine current chain coordinates
-        current_matrix = np.vstack([person_coords[chain_id], item_coords[chain_id]])
 
-        # Perform Procrustes alignment
-        _, aligned_matrix, disparity = procrustes(reference_matrix, current_matrix)
+def _align_chains(
+    coords: np.ndarray, chain_ids: list[int], ref_chain_id: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Procrustes-align stacked chain coordinates onto the reference chain.
 
-        print(
-            f"Aligning Chain {chain_id} to Chain {ref_chain_id}. "
-            f"Disparity: {disparity:.4f}"
+    ``coords`` has shape (n_chains, n_points, D). The reference chain is
+    returned as is; every other chain is standardized, rotated and rescaled
+    onto the standardized reference with one batched SVD. Also returns the
+    per-chain centers (n_chains, 1, D) and matrices (n_chains, D, D) of the
+    equivalent affine maps ``(coords - center) @ matrix``.
+    """
+    n_chains, _, D = coords.shape
+    ref_pos = chain_ids.index(ref_chain_id)
+    others = [k for k in range(len(chain_ids)) if k != ref_pos]
+
+    aligned = coords.copy()
+    centers = np.zeros((n_chains, 1, D))
+    matrices = np.broadcast_to(np.eye(D), (n_chains, D, D)).copy()
+    if not others:
+        return aligned, centers, matrices
+
+    ref_unit, _, _ = _standardize(coords[ref_pos])
+    current_unit, current_center, current_norm = _standardize(coords[others])
+
+    # Perform Procrustes alignment for all chains at once: the rotations come
+    # from one batched SVD of the D x D cross-products, the scales from their
+    # singular values
+    cross = np.einsum("cji,jk->cik", current_unit, ref_unit)
+    U, S, Vt = np.linalg.svd(cross, full_matrices=False)
+    scale = S.sum(axis=-1)
+    rotation = U @ Vt
+    aligned[others] = current_unit @ rotation * scale[:, None, None]
+    centers[others] = current_center
+    matrices[others] = rotation * (scale[:, None, None] / current_norm)
+    disparities = 1 - scale**2
+
+    for pos, disparity in zip(others, disparities):
+        logger.info(
+            "Aligning Chain %s to Chain %s. Disparity: %.4f",
+            chain_ids[pos],
+            ref_chain_id,
+            disparity,
         )
 
-        # Split back into person and item parts
-        aligned_person_coords[chain_id] = aligned_matrix[:n_persons, :]
-        aligned_item_coords[chain_id] = aligned_matrix[n_persons:, :]
+    return aligned, centers, matrices
 
-    return aligned_person_coords, aligned_item_coords
+
+def _standardize(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Center coordinate matrices and scale each to unit Frobenius norm.
+
+    Accepts a single (n, D) matrix or a stack of shape (..., n, D). Returns
+    the standardized matrices with the centers and norms that were removed.
+    """
+    center = matrix.mean(axis=-2, keepdims=True)
+    centered = matrix - center
+    norm = np.linalg.norm(centered, axis=(-2, -1), keepdims=True)
+    if np.any(norm == 0):
+        raise ValueError("Input matrices must contain >1 unique points")
+
+    return centered / norm, center, norm
 
 
 def create_aligned_draws_dataframe(
@@ -178,6 +371,8 @@ def create_aligned_draws_dataframe(
     aligned_person_coords: dict[int, np.ndarray],
     aligned_item_coords: dict[int, np.ndarray],
     D: int,
+    chain_rows: dict[int, np.ndarray] | None = None,
+    transforms: dict[int, tuple[np.ndarray, np.ndarray]] | None = None,
 ) -> pd.DataFrame:
     """
     Create DataFrame with aligned latent coordinates replacing original draws.
@@ -192,6 +387,13 @@ def create_aligned_draws_dataframe(
         Aligned item coordinates by chain.
     D : int
         Number of latent dimensions.
+    chain_rows : dict[int, np.ndarray] or None, optional
+        Row positions by chain from ``chain_row_indices``. Computed if None.
+    transforms : dict[int, tuple[np.ndarray, np.ndarray]] or None, optional
+        Per-chain transforms from ``align_latent_spaces`` with
+        ``return_transforms=True``. If given, every draw is aligned with its
+        chain's transform instead of being replaced by the aligned chain
+        mean. Default is None.
 
     Returns
     -------
@@ -201,29 +403,159 @@ def create_aligned_draws_dataframe(
         - Replaces all ``xi[i,d]`` parameters with aligned person coordinates.
         - Replaces all ``zt_centered[i,d]`` parameters with aligned item coordinates.
         - Preserves all other parameters and metadata columns.
+
+    .. Note::
+        - ``original_draws`` is not modified; non-latent columns are shared
+          with it rather than copied.
+        - With ``transforms``, all ``xi`` and ``zt_centered`` columns must be
+          present; the aligned draws average to the aligned chain means.
     """
-    aligned_draws = original_draws.copy()
+    # Only the latent columns change, and they are replaced with new arrays,
+    # so the remaining columns can share memory with ``original_draws``
+    aligned_draws = original_draws.copy(deep=False)
+
+    if chain_rows is None:
+        chain_rows = chain_row_indices(aligned_draws)
+
+    if transforms is not None:
+        n_persons = next(iter(aligned_person_coords.values())).shape[0]
+        n_items = next(iter(aligned_item_coords.values())).shape[0]
+        _transform_latent_draws(
+            aligned_draws, n_persons, n_items, D, transforms, chain_rows
+        )
+        return aligned_draws
 
-    # Replace person coordinates
-    for chain_id, coords in aligned_person_coords.items():
-        chain_mask = aligned_draws["chain__"] == chain_id
-        n_persons = coords.shape[0]
+    _replace_latent_columns(aligned_draws, aligned_person_coords, "xi", D, chain_rows)
+    _replace_latent_columns(
+        aligned_draws, aligned_item_coords, "zt_centered", D, chain_rows
+    )
 
-        for i in range(n_persons):
-            for d in range(D):
-                param_name = f"xi[{i + 1},{d + 1}]"
-                if param_name in aligned_draws.columns:
-                    aligned_draws.loc[chain_mask, param_name] = coords[i, d]
+    return aligned_draws
 
-    # Replace item coordinates
-    for chain_id, coords in aligned_item_coords.items():
-        chain_mask = aligned_draws["chain__"] == chain_id
-        n_items = coords.shape[0]
 
-        for i in range(n_items):
-            for d in range(D):
-                param_name = f"zt_centered[{i + 1},{d + 1}]"
-                if param_name in aligned_draws.columns:
-                    aligned_draws.loc[chain_mask, param_name] = coords[i, d]
+def _replace_latent_columns(
+    aligned_draws: pd.DataFrame,
+    aligned_coords: dict[int, np.ndarray],
+    prefix: str,
+    D: int,
+    chain_rows: dict[int, np.ndarray],
+) -> None:
+    """
+    Overwrite ``prefix[i,d]`` columns in place with aligned chain coordinates.
 
-    return aligned_draws
+    When every chain is replaced, the block is built by gathering each row's
+    chain means with one ``np.take``; otherwise the existing columns are
+    copied and the given chains' rows overwritten. Either way the block is
+    assigned back in a single write.
+    """
+    n_entities = next(iter(aligned_coords.values())).shape[0]
+
+    # Positions follow the C-order ravel of each (n_entities, D) matrix
+    col_idx = _param_index(aligned_draws, prefix, n_entities, D).ravel()
+    keep = col_idx >= 0
+    if not keep.any():
+        return
+    cols = aligned_draws.columns[col_idx[keep]].tolist()
+
+    if chain_rows.keys() <= aligned_coords.keys():
+        # Broadcast chain means to rows without reading the original columns
+        row_chain = np.empty(len(aligned_draws), dtype=np.intp)
+        for pos, rows in enumerate(chain_rows.values()):
+            row_chain[rows] = pos
+        means = np.stack(
+            [aligned_coords[chain_id].ravel()[keep] for chain_id in chain_rows]
+        )
+        block = np.take(means, row_chain, axis=0)
+    else:
+        block = aligned_draws.iloc[:, col_idx[keep]].to_numpy(
+            dtype=np.float64, copy=True
+        )
+        for chain_id, coords in aligned_coords.items():
+            block[chain_rows[chain_id]] = coords.ravel()[keep]
+
+    aligned_draws[cols] = block
+
+
+def _transform_latent_draws(
+    aligned_draws: pd.DataFrame,
+    n_persons: int,
+    n_items: int,
+    D: int,
+    transforms: dict[int, tuple[np.ndarray, np.ndarray]],
+    chain_rows: dict[int, np.ndarray],
+) -> None:
+    """
+    Align every draw's latent coordinates in place with its chain's transform.
+
+    Each chain's rows of the ``xi``/``zt_centered`` block are viewed as
+    (n_draws, n_persons + n_items, D) and mapped with one batched matmul.
+    """
+    person_block, person_cols = extract_latent_blocks(aligned_draws, "xi", n_persons, D)
+    item_block, item_cols = extract_latent_blocks(
+        aligned_draws, "zt_centered", n_items, D
+    )
+
+    # Each row ravels vstack([xi, zt_centered]) of one draw
+    block = np.hstack([person_block, item_block])
+    for chain_id, (center, matrix) in transforms.items():
+        rows = chain_rows[chain_id]
+        draws = block[rows].reshape(len(rows), -1, D)
+        block[rows] = ((draws - center) @ matrix).reshape(len(rows), -1)
+
+    aligned_draws[person_cols + item_cols] = block
+
+
+def rotate_draws_inplace(
+    df_draws: pd.DataFrame,
+    n_persons: int,
+    n_items: int,
+    D: int,
+    ref_chain_id: int = 1,
+    chain_rows: dict[int, np.ndarray] | None = None,
+) -> None:
+    """
+    Extract, align and replace latent coordinates in a single pass.
+
+    Equivalent to ``create_aligned_draws_dataframe`` applied to the output of
+    ``extract_latent_coordinates`` and ``align_latent_spaces``, but the
+    ``xi`` and ``zt_centered`` columns are read once into a single block,
+    reduced to chain means, aligned, and written back to ``df_draws``.
+
+    Parameters
+    ----------
+    df_draws : pd.DataFrame
+        Stan draws with ``chain__`` column, modified in place.
+    n_persons : int
+        Number of persons.
+    n_items : int
+        Number of items.
+    D : int
+        Number of latent dimensions.
+    ref_chain_id : int, optional
+        Reference chain ID for alignment. Default is 1.
+    chain_rows : dict[int, np.ndarray] or None, optional
+        Row positions by chain from ``chain_row_indices``. Computed if None.
+
+    Returns
+    -------
+    None
+
+    .. Note::
+        - Use ``df_draws.copy(deep=False)`` to keep the original draws; only
+          the latent columns are replaced.
+    """
+    if chain_rows is None:
+        chain_rows = chain_row_indices(df_draws)
+
+    person_block, person_cols = extract_latent_blocks(df_draws, "xi", n_persons, D)
+    item_block, item_cols = extract_latent_blocks(df_draws, "zt_centered", n_items, D)
+
+    # Each row ravels vstack([xi, zt_centered]) of one draw
+    block = np.hstack([person_block, item_block])
+    means = _chain_means(block, chain_rows).reshape(len(chain_rows), -1, D)
+    aligned, _, _ = _align_chains(means, list(chain_rows), ref_chain_id)
+
+    for rows, coords in zip(chain_rows.values(), aligned):
+        block[rows] = coords.ravel()
+
+    df_draws[person_cols + item_cols] = block